@@ -4,7 +4,7 @@ import structlog
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.wsgi import WSGIMiddleware
 
-from src.api.errors import add_exception_handlers
+from src.api.errors import EXCEPTION_HANDLERS
 from src.api.routes import admin as admin_router_module
 from src.api.routes import files as files_router_module
 from src.api.routes import jobs as jobs_router_module
@@ -52,6 +52,7 @@ def _create_fastapi_app() -> FastAPI:  # noqa: D401 – factory
         docs_url="/docs",
         redoc_url=None,
         openapi_url="/openapi.json",
+        exception_handlers=EXCEPTION_HANDLERS,
     )
 
     # Middleware – logging comes first so later handlers inherit context vars.
@@ -74,7 +75,6 @@ def _create_fastapi_app() -> FastAPI:  # noqa: D401 – factory
         return {"message": "HeronAI Document Classifier – FastAPI layer"}
 
     _register_routes(app_instance)
-    add_exception_handlers(app_instance)
 
     if settings.prometheus_enabled and _PROM_AVAILABLE:  # pragma: no cover –
         Instrumentator().instrument(app_instance).expose(  # noqa: WPS437 fluent chain
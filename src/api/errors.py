@@ -1,139 +1,208 @@
-from __future__ import annotations
-
+import sys
 from http import HTTPStatus
-from typing import Any, Dict
+from typing import Any, Callable, Coroutine, Dict, Final, Type
 
+import orjson
 import structlog
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import Scope
+
+from src.core.config import get_settings
 
-__all__: list[str] = ["add_exception_handlers"]
+__all__: list[str] = ["EXCEPTION_HANDLERS", "add_exception_handlers"]
 
 logger = structlog.get_logger("errors")
+settings = get_settings()
+
+_ORJSON_OPTIONS: int = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
 
+class _FastJSONResponse(Response):
+    """orjson-rendered JSON response shared by every handler in this module.
 
-def _build_error_payload(
-    code: str | int,
-    message: str,
-    request_id: str | None = None,
-    extra: Dict[str, Any] | None = None,
-) -> Dict[str, Any]:
-    """Return a JSON-serialisable error envelope.
-
-    Parameters
-    ----------
-    code:
-        A machine-readable error code (snake_case) or HTTP status integer.
-    message:
-        Human-readable description (English, sentence-cased).
-    request_id:
-        Optional correlation ID injected by `RequestLoggingMiddleware`.
-    extra:
-        Optional additional payload for debugging (e.g. validation details).
+    Subclasses `Response` directly (skipping `ORJSONResponse`'s extra layer)
+    and falls back to ``str`` for anything orjson cannot encode natively,
+    e.g. exception instances or non-string keys in error payloads.  Bodies
+    already encoded to ``bytes`` are sent as-is.
     """
 
-    payload: Dict[str, Any] = {
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, default=str, option=_ORJSON_OPTIONS)
+
+
+_HTTP_422: Final[int] = status.HTTP_422_UNPROCESSABLE_ENTITY
+_HTTP_500: Final[int] = int(HTTPStatus.INTERNAL_SERVER_ERROR)
+
+# Log events, error codes and messages shared by every response.
+_HTTP_EXCEPTION_EVENT: Final[str] = sys.intern("http_exception")
+_VALIDATION_ERROR_EVENT: Final[str] = sys.intern("validation_error")
+_UNHANDLED_EXCEPTION_EVENT: Final[str] = sys.intern("unhandled_exception")
+_VALIDATION_CODE: Final[str] = sys.intern("validation_error")
+_VALIDATION_MESSAGE: Final[str] = sys.intern("Invalid request parameters.")
+_INTERNAL_CODE: Final[str] = sys.intern("internal_server_error")
+_INTERNAL_MESSAGE: Final[str] = sys.intern("An unexpected error occurred.")
+
+# The 500 envelope is constant apart from ``request_id`` – serialise it once
+# and splice the (JSON-encoded) ID into the placeholder per request.
+_REQUEST_ID_PLACEHOLDER: Final[bytes] = b'"__RID__"'
+_INTERNAL_500_TEMPLATE: Final[bytes] = orjson.dumps(
+    {
         "error": {
-            "code": code,
-            "message": message,
-            "request_id": request_id,
+            "code": _INTERNAL_CODE,
+            "message": _INTERNAL_MESSAGE,
+            "request_id": "__RID__",
         }
     }
-    if extra:
-        payload["error"].update(extra)
-    return payload
+)
+
+# The 422 envelope is assembled by byte concatenation around the two variable
+# parts (``request_id`` and ``details``) – no intermediate dict is built.
+_VALIDATION_ENVELOPE_PREFIX: Final[bytes] = (
+    b'{"error":{"code":'
+    + orjson.dumps(_VALIDATION_CODE)
+    + b',"message":'
+    + orjson.dumps(_VALIDATION_MESSAGE)
+    + b',"request_id":'
+)
+_VALIDATION_ENVELOPE_MID: Final[bytes] = b',"details":'
+_VALIDATION_ENVELOPE_SUFFIX: Final[bytes] = b"}}"
+
+
+def _request_id(scope: Scope) -> str | None:
+    """Return the ``x-request-id`` header straight from the ASGI *scope*.
+
+    Avoids building Starlette's case-insensitive `Headers` wrapper; ASGI
+    servers already lower-case header names.  Values are decoded as latin-1
+    like Starlette does, so arbitrary header bytes never raise here.
+    """
+
+    headers: list[tuple[bytes, bytes]] = scope["headers"]
+    for key, value in headers:
+        if key == b"x-request-id":
+            return value.decode("latin-1")
+    return None
 
 
 async def _http_exception_handler(
     request: Request,
-    exc: Exception,
-) -> JSONResponse:
+    star_exc: StarletteHTTPException,
+) -> _FastJSONResponse:
     """Handle exceptions explicitly raised by the application/routers."""
 
-    if isinstance(exc, StarletteHTTPException):
-        star_exc: StarletteHTTPException = exc
-    else:
-        star_exc = StarletteHTTPException(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-            detail=str(exc),
-        )
+    scope = request.scope
+    path: str = scope["path"]
+    detail = star_exc.detail
+    detail_str: str = detail if detail.__class__ is str else str(detail)
 
     logger.warning(
-        "http_exception",
-        path=request.url.path,
+        _HTTP_EXCEPTION_EVENT,
+        path=path,
         status_code=star_exc.status_code,
-        detail=str(star_exc.detail),
+        detail=detail_str,
     )
 
-    payload = _build_error_payload(
-        code=star_exc.status_code,
-        message=str(star_exc.detail),
-        request_id=request.headers.get("x-request-id"),
-    )
-    payload["detail"] = str(star_exc.detail)
+    rid = _request_id(scope)
+    payload = {
+        "error": {
+            "code": str(star_exc.status_code),
+            "message": detail_str,
+            "request_id": rid,
+        },
+        # Top-level ``detail`` mirrors FastAPI's default error shape for clients.
+        "detail": detail_str,
+    }
 
-    return JSONResponse(status_code=star_exc.status_code, content=payload)
+    return _FastJSONResponse(status_code=star_exc.status_code, content=payload)
 
 
 async def _validation_error_handler(
     request: Request,
-    exc: Exception,
-) -> JSONResponse:
+    validation_exc: RequestValidationError,
+) -> _FastJSONResponse:
     """Handle body/query/path parameter validation failures (422)."""
 
-    if isinstance(exc, RequestValidationError):
-        validation_exc: RequestValidationError = exc
-    else:
-        validation_exc = RequestValidationError(
-            [{"loc": (), "msg": str(exc), "type": "error"}]
-        )
+    scope = request.scope
+    path: str = scope["path"]
+    # ``errors()`` rebuilds the list from the pydantic error tree – call once.
+    errors = validation_exc.errors()
 
     logger.warning(
-        "validation_error",
-        path=request.url.path,
-        errors=validation_exc.errors(),
+        _VALIDATION_ERROR_EVENT,
+        path=path,
+        errors=errors,
     )
 
-    payload = _build_error_payload(
-        code="validation_error",
-        message="Invalid request parameters.",
-        request_id=request.headers.get("x-request-id"),
-        extra={"details": validation_exc.errors()},
-    )
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content=payload
+    rid = _request_id(scope)
+    body = (
+        _VALIDATION_ENVELOPE_PREFIX
+        + orjson.dumps(rid)
+        + _VALIDATION_ENVELOPE_MID
+        + orjson.dumps(errors, default=str, option=_ORJSON_OPTIONS)
+        + _VALIDATION_ENVELOPE_SUFFIX
     )
+    return _FastJSONResponse(content=body, status_code=_HTTP_422)
 
 
 async def _unhandled_exception_handler(
     request: Request,
     exc: Exception,
-) -> JSONResponse:  # noqa: D401 – FastAPI handler sig
+) -> _FastJSONResponse:
     """Catch-all for unexpected errors – returns HTTP 500."""
 
-    logger.exception(
-        "unhandled_exception",
-        path=request.url.path,
-        error=str(exc),  # Log the specific error message
-        error_type=type(exc).__name__,  # Log the type of the error
-    )
+    scope = request.scope
+    path: str = scope["path"]
 
-    payload = _build_error_payload(
-        code="internal_server_error",
-        message="An unexpected error occurred.",
-        request_id=request.headers.get("x-request-id"),
-    )
-    return JSONResponse(
-        status_code=HTTPStatus.INTERNAL_SERVER_ERROR,  # 500
-        content=payload,
+    if settings.log_tracebacks:
+        logger.exception(
+            _UNHANDLED_EXCEPTION_EVENT,
+            path=path,
+            error=str(exc),  # Log the specific error message
+            error_type=type(exc).__name__,  # Log the type of the error
+        )
+    else:
+        # Type and message only – skip capturing/formatting the traceback.
+        logger.error(
+            _UNHANDLED_EXCEPTION_EVENT,
+            path=path,
+            error=str(exc),
+            error_type=type(exc).__name__,
+        )
+
+    rid = _request_id(scope)
+    body = _INTERNAL_500_TEMPLATE.replace(
+        _REQUEST_ID_PLACEHOLDER,
+        orjson.dumps(rid),
     )
+    return _FastJSONResponse(content=body, status_code=_HTTP_500)
+
 
+# Handed to ``FastAPI(exception_handlers=...)`` so the handler map is final
+# when the app is constructed.  Keep one entry per type: Starlette installs
+# the ``Exception`` handler in ``ServerErrorMiddleware`` only, so a single
+# catch-all would never see HTTP or validation errors – those are resolved by
+# ``ExceptionMiddleware``, which would fall back to FastAPI's defaults.
+EXCEPTION_HANDLERS: Dict[
+    int | Type[Exception],
+    Callable[[Request, Any], Coroutine[Any, Any, Response]],
+] = {
+    StarletteHTTPException: _http_exception_handler,
+    RequestValidationError: _validation_error_handler,
+    Exception: _unhandled_exception_handler,
+}
 
-def add_exception_handlers(app: FastAPI) -> None:  # noqa: D401 – imperative
-    """Register all global exception handlers on **app**."""
 
-    app.add_exception_handler(StarletteHTTPException, _http_exception_handler)
-    app.add_exception_handler(RequestValidationError, _validation_error_handler)
-    app.add_exception_handler(Exception, _unhandled_exception_handler)
+def add_exception_handlers(app: FastAPI) -> None:
+    """Register all global exception handlers on an existing **app**.
+
+    Prefer passing `EXCEPTION_HANDLERS` to the `FastAPI` constructor; this
+    wrapper remains for apps that are built elsewhere.
+    """
+
+    app.exception_handlers.update(EXCEPTION_HANDLERS)
@@ -111,7 +111,7 @@ async def upload_and_classify_files(
                 status_code=e.status_code,
                 content={
                     "error": {
-                        "code": e.status_code,
+                        "code": str(e.status_code),
                         "message": e.detail,
                         "request_id": batch_request_id,
                     },
@@ -170,7 +170,7 @@ async def upload_and_classify_files(
                 status_code=e.status_code,
                 content={
                     "error": {
-                        "code": e.status_code,
+                        "code": str(e.status_code),
                         "message": e.detail,
                         "request_id": batch_request_id,
                     },
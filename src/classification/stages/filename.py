@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import os
 import re
-from typing import Dict, Tuple
+from typing import Dict, Pattern, Tuple
 
 from starlette.datastructures import UploadFile
 
@@ -29,6 +29,22 @@ DOCUMENT_PATTERNS: Dict[str, Tuple[str, float]] = {
     r"form|application": ("form", 0.85),
 }
 
+# All DOCUMENT_PATTERNS folded into one compiled regex. Each branch is a
+# lookahead for one pattern followed by an empty marker group, so ``match`` at
+# position 0 tries the patterns in dict order and the first hit wins, exactly
+# like searching them one by one. DOTALL is scoped to the ``.*?`` prefix so the
+# patterns' own ``.`` still stops at newlines.
+_PATTERN_OUTCOMES: Dict[str, Tuple[str, float]] = {
+    f"_p{i}": outcome for i, outcome in enumerate(DOCUMENT_PATTERNS.values())
+}
+_FILENAME_PATTERN: Pattern[str] = re.compile(
+    "|".join(
+        f"(?=(?s:.*?)(?:{pattern}))(?P<_p{i}>)"
+        for i, pattern in enumerate(DOCUMENT_PATTERNS)
+    ),
+    re.IGNORECASE,
+)
+
 
 async def stage_filename(file: UploadFile) -> StageOutcome:
     """
@@ -46,8 +62,9 @@ async def stage_filename(file: UploadFile) -> StageOutcome:
 
     filename = os.path.basename(file.filename).lower()
 
-    for pattern, (label, confidence) in DOCUMENT_PATTERNS.items():
-        if re.search(pattern, filename, re.IGNORECASE):
-            return StageOutcome(label=label, confidence=confidence)
+    match = _FILENAME_PATTERN.match(filename)
+    if match is not None and match.lastgroup is not None:
+        label, confidence = _PATTERN_OUTCOMES[match.lastgroup]
+        return StageOutcome(label=label, confidence=confidence)
 
     return StageOutcome(label=None, confidence=None)
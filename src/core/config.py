@@ -75,6 +75,7 @@ class Settings(BaseSettings):
     pipeline_version: str = "v0.1.0"
     commit_sha: Optional[str] = None
     prometheus_enabled: bool = True
+    log_tracebacks: bool = False
 
     # Fallbacks, pydantic will look for these in .env first
     allowed_api_keys: List[str] = Field(default_factory=list)
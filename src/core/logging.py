@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import time
 import uuid
@@ -33,35 +36,138 @@ def _ensure_request_context(
 
 
 # Re-assemble the JSON processor chain with the new helper placed *after*
-# ``merge_contextvars`` so it only fills in missing keys.
-_JSON_PROCESSORS: list[Processor] = [
+# ``merge_contextvars`` so it only fills in missing keys.  These run in the
+# calling thread; JSON rendering is deferred to the handler's formatter.
+# ``format_exc_info`` must run here too: ``exc_info=True`` is resolved via
+# ``sys.exc_info()``, which is empty on the listener thread.
+_SHARED_PROCESSORS: list[Processor] = [
     structlog.contextvars.merge_contextvars,
     _ensure_request_context,
     structlog.processors.add_log_level,
     structlog.processors.TimeStamper(fmt="iso"),
-    structlog.processors.JSONRenderer(),
+    structlog.processors.format_exc_info,
+]
+
+_JSON_PROCESSORS: list[Processor] = [
+    *_SHARED_PROCESSORS,
+    structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
 ]
 
+# Context captured for foreign (plain stdlib) records in the *calling* thread.
+# The listener thread that formats them has none of the request's contextvars
+# and would otherwise stamp them with the render time.
+_CALLER_PROCESSORS: list[Processor] = [
+    structlog.contextvars.merge_contextvars,
+    structlog.processors.TimeStamper(fmt="iso"),
+]
+
+_CALLER_CONTEXT_ATTR = "_structlog_caller_context"
+
+
+def _caller_context() -> structlog.types.EventDict:
+    event_dict: structlog.types.EventDict = {}
+    for processor in _CALLER_PROCESSORS:
+        event_dict = processor(None, "", event_dict)  # type: ignore[assignment]
+    return event_dict
+
+
+def _merge_caller_context(
+    logger: Any,
+    method_name: str,
+    event_dict: structlog.types.EventDict,
+) -> structlog.types.EventDict:
+    """Merge the context `_InProcessQueueHandler` captured for a foreign record."""
+
+    record = event_dict.get("_record")
+    context = getattr(record, _CALLER_CONTEXT_ATTR, None)
+    if context is None:  # record did not pass through the queue handler
+        context = _caller_context()
+    return {**context, **event_dict}
+
+
+# Foreign records carry their exc_info tuple on the record, so formatting the
+# traceback on the listener thread is safe.
+_FOREIGN_PRE_CHAIN: list[Processor] = [
+    _merge_caller_context,
+    _ensure_request_context,
+    structlog.processors.add_log_level,
+    structlog.processors.format_exc_info,
+]
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """`QueueHandler` that enqueues records without formatting them.
+
+    The stock ``prepare`` formats the message eagerly (in the caller's thread)
+    so records can be pickled.  Our queue never leaves the process, and the
+    `ProcessorFormatter` downstream needs structlog's event dict intact.
+    Foreign stdlib records do get their contextvars and timestamp captured
+    here, since only the caller's thread has them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not hasattr(record, "_logger"):  # not wrapped by structlog
+            setattr(record, _CALLER_CONTEXT_ATTR, _caller_context())
+        return record
+
+
+_QUEUE_LISTENER: logging.handlers.QueueListener | None = None
+
+
+def _stop_queue_listener() -> None:
+    """Drain pending records and stop the background writer thread."""
+
+    global _QUEUE_LISTENER
+
+    if _QUEUE_LISTENER is not None:
+        _QUEUE_LISTENER.stop()
+        _QUEUE_LISTENER = None
+
+
+# Flush whatever is still queued when the interpreter exits.
+atexit.register(_stop_queue_listener)
+
 
 def _configure_stdlib_logging(level: int) -> None:
     """Configure the built-in *logging* module to route records to structlog.
 
     The FastAPI ecosystem (Uvicorn, Starlette) still uses stdlib logging.  We
-    therefore configure a **StreamHandler** pointing to *stderr* and set a
-    simple formatter.  Structlog will pick up the record and apply its own
-    processors, ensuring consistent output.
+    therefore configure a **StreamHandler** pointing to *stderr* with a
+    `ProcessorFormatter` – structlog events and foreign stdlib records are
+    both rendered to JSON there, ensuring consistent output.
+
+    The root logger itself only holds a `QueueHandler`; rendering and *stderr*
+    I/O run on a `QueueListener` thread so request handlers never block on
+    them.
     """
 
+    global _QUEUE_LISTENER
+
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
     handler = logging.StreamHandler(sys.stderr)
     handler.setLevel(level)
-    handler.setFormatter(logging.Formatter("%(message)s"))  # structlog formats
+    handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.JSONRenderer(),
+            ],
+            foreign_pre_chain=_FOREIGN_PRE_CHAIN,
+        )
+    )
+
+    _stop_queue_listener()
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _QUEUE_LISTENER = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _QUEUE_LISTENER.start()
 
     # Remove default handlers to avoid duplicate logs in some runtimes.
     root_logger.handlers.clear()
-    root_logger.addHandler(handler)
+    root_logger.addHandler(_InProcessQueueHandler(log_queue))
 
 
 _LOGGING_CONFIGURED: bool = False
@@ -94,7 +200,7 @@ def configure_logging(debug: bool = False) -> None:
         wrapper_class=structlog.make_filtering_bound_logger(level),
         processors=_JSON_PROCESSORS,
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
@@ -23,6 +23,7 @@ class MockSettings:  # Does NOT inherit from real Settings
     pipeline_version: str = "v_test_pipeline"
     commit_sha: Optional[str] = None
     prometheus_enabled: bool = True
+    log_tracebacks: bool = False
 
     # API key configuration
     allowed_api_keys: List[str] = []
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
+import inspect
 import json
+import logging
 from unittest.mock import MagicMock, patch
 
 import pytest
+import structlog
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.testclient import TestClient
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+import src.core.logging
 from src.api.app import _create_fastapi_app
 from src.api.errors import (
+    EXCEPTION_HANDLERS,
     _http_exception_handler,
     _unhandled_exception_handler,
     _validation_error_handler,
     add_exception_handlers,
 )
 from src.core.config import Settings, get_settings
+from src.core.logging import configure_logging
 from tests.conftest import MockSettings
 
 
@@ -40,33 +46,35 @@ def mock_request_scope() -> dict:
 
 
 @pytest.mark.asyncio
-async def test_http_exception_handler_generic_exception(
+async def test_http_exception_handler_direct(
     mock_request_scope: dict,
 ) -> None:
-    """Test _http_exception_handler with a generic Exception."""
+    """Test _http_exception_handler invoked directly with an HTTPException."""
     request = Request(mock_request_scope)
-    exc = Exception("Generic test error")
+    exc = StarletteHTTPException(status_code=409, detail="Conflict test error")
     response = await _http_exception_handler(request, exc)
-    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert response.status_code == status.HTTP_409_CONFLICT
     payload = json.loads(response.body.decode())
-    assert payload["error"]["message"] == "Generic test error"
-    assert payload["error"]["code"] == 500
-    assert payload["detail"] == "Generic test error"
+    assert payload["error"]["message"] == "Conflict test error"
+    assert payload["error"]["code"] == "409"
+    assert payload["detail"] == "Conflict test error"
 
 
 @pytest.mark.asyncio
-async def test_validation_error_handler_generic_exception(
+async def test_validation_error_handler_direct(
     mock_request_scope: dict,
 ) -> None:
-    """Test _validation_error_handler with a generic Exception."""
+    """Test _validation_error_handler invoked directly with a validation error."""
     request = Request(mock_request_scope)
-    exc = Exception("Generic validation error")  # Simulate a non-RequestValidationError
+    exc = RequestValidationError(
+        [{"loc": ("query", "q"), "msg": "Direct validation error", "type": "error"}]
+    )
     response = await _validation_error_handler(request, exc)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     payload = json.loads(response.body.decode())
     assert payload["error"]["message"] == "Invalid request parameters."
     assert payload["error"]["code"] == "validation_error"
-    assert "Generic validation error" in str(payload["error"]["details"])
+    assert payload["error"]["details"][0]["msg"] == "Direct validation error"
 
 
 @pytest.mark.asyncio
@@ -79,6 +87,131 @@ async def test_unhandled_exception_handler(mock_request_scope: dict) -> None:
     payload = json.loads(response.body.decode())
     assert payload["error"]["message"] == "An unexpected error occurred."
     assert payload["error"]["code"] == "internal_server_error"
+    assert payload["error"]["request_id"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("log_tracebacks", [True, False])
+async def test_unhandled_exception_handler_traceback_flag(
+    mock_request_scope: dict,
+    mock_settings: MockSettings,
+    log_tracebacks: bool,
+) -> None:
+    """Tracebacks are only requested from the logger when enabled."""
+    mock_settings.log_tracebacks = log_tracebacks
+    request = Request(mock_request_scope)
+    with (
+        patch("src.api.errors.settings", mock_settings),
+        patch("src.api.errors.logger") as mock_logger,
+    ):
+        await _unhandled_exception_handler(request, ValueError("boom"))
+
+    expected_kwargs = {"path": "/test", "error": "boom", "error_type": "ValueError"}
+    if log_tracebacks:
+        mock_logger.exception.assert_called_once_with(
+            "unhandled_exception", **expected_kwargs
+        )
+        mock_logger.error.assert_not_called()
+    else:
+        mock_logger.error.assert_called_once_with(
+            "unhandled_exception", **expected_kwargs
+        )
+        mock_logger.exception.assert_not_called()
+
+
+@pytest.fixture
+def reset_logging_state(monkeypatch: pytest.MonkeyPatch):
+    """Let a test configure the real logging pipeline, then restore global state."""
+    # Leave the listener owned by the app's own configuration untouched.
+    monkeypatch.setattr("src.core.logging._QUEUE_LISTENER", None)
+    monkeypatch.setattr("src.core.logging._LOGGING_CONFIGURED", False)
+    root_logger = logging.getLogger()
+    original_handlers, original_level = root_logger.handlers[:], root_logger.level
+    structlog.reset_defaults()
+
+    yield
+
+    src.core.logging._stop_queue_listener()
+    structlog.reset_defaults()
+    root_logger.handlers[:] = original_handlers
+    root_logger.setLevel(original_level)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("log_tracebacks", [True, False])
+async def test_unhandled_exception_traceback_rendered_only_when_enabled(
+    mock_request_scope: dict,
+    mock_settings: MockSettings,
+    reset_logging_state: None,
+    capsys: pytest.CaptureFixture[str],
+    log_tracebacks: bool,
+) -> None:
+    """LOG_TRACEBACKS controls whether the rendered 500 log has a traceback."""
+    configure_logging(debug=False)
+    mock_settings.log_tracebacks = log_tracebacks
+    request = Request(mock_request_scope)
+    # The module logger may already be cached against an earlier configuration.
+    with (
+        patch("src.api.errors.settings", mock_settings),
+        patch("src.api.errors.logger", structlog.get_logger("errors")),
+    ):
+        try:
+            raise ValueError("boom")
+        except ValueError as exc:  # handlers run inside Starlette's except block
+            await _unhandled_exception_handler(request, exc)
+    src.core.logging._stop_queue_listener()  # drain the queue
+
+    (line,) = capsys.readouterr().err.strip().splitlines()
+    payload = json.loads(line)
+    assert payload["event"] == "unhandled_exception"
+    if log_tracebacks:
+        assert "Traceback (most recent call last)" in payload["exception"]
+        assert "ValueError: boom" in payload["exception"]
+    else:
+        assert "exception" not in payload
+        assert "exc_info" not in payload
+
+
+@pytest.mark.asyncio
+async def test_unhandled_exception_handler_non_utf8_request_id(
+    mock_request_scope: dict,
+) -> None:
+    """Request IDs are decoded like Starlette headers (latin-1), never raising."""
+    mock_request_scope["headers"] = [
+        (b"x-other", b"ignored"),
+        (b"x-request-id", b"id-\xff"),
+    ]
+    request = Request(mock_request_scope)
+    response = await _unhandled_exception_handler(request, ValueError("boom"))
+    payload = json.loads(response.body.decode())
+    assert payload["error"]["request_id"] == request.headers["x-request-id"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "handler, exc, expected_status",
+    [
+        (_http_exception_handler, StarletteHTTPException(status_code=404), 404),
+        (_validation_error_handler, RequestValidationError([]), 422),
+        (_unhandled_exception_handler, ValueError("boom"), 500),
+    ],
+)
+async def test_handlers_build_same_response_for_head(
+    mock_request_scope: dict,
+    handler,
+    exc: Exception,
+    expected_status: int,
+) -> None:
+    """HEAD gets the GET envelope; the server drops the body, keeping Content-Length."""
+    get_response = await handler(Request(mock_request_scope), exc)
+    mock_request_scope["method"] = "HEAD"
+    head_response = await handler(Request(mock_request_scope), exc)
+    assert head_response.status_code == expected_status
+    assert head_response.body == get_response.body
+    assert (
+        head_response.headers["content-length"]
+        == get_response.headers["content-length"]
+    )
 
 
 def test_add_exception_handlers() -> None:
@@ -92,6 +225,50 @@ def test_add_exception_handlers() -> None:
     assert Exception in app_instance.exception_handlers
 
 
+def test_exception_handlers_run_on_the_event_loop() -> None:
+    """Handlers stay ``async`` so Starlette never offloads them to a threadpool."""
+    for handler in EXCEPTION_HANDLERS.values():
+        assert inspect.iscoroutinefunction(handler)
+
+
+def test_create_fastapi_app_uses_exception_handlers(
+    mock_settings: MockSettings,
+) -> None:
+    """The app factory wires the shared handler map at construction time."""
+    with patch("src.api.app.settings", mock_settings):
+        test_app = _create_fastapi_app()
+    for exc_class, handler in EXCEPTION_HANDLERS.items():
+        assert test_app.exception_handlers[exc_class] is handler
+
+
+def test_create_fastapi_app_routes_http_errors_to_envelope(
+    mock_settings: MockSettings,
+) -> None:
+    """4xx errors raised inside routing use our envelope, not FastAPI's default."""
+    with patch("src.api.app.settings", mock_settings):
+        test_app = _create_fastapi_app()
+    response = TestClient(test_app).get("/does-not-exist")
+    assert response.status_code == 404
+    payload = response.json()
+    assert payload["error"]["code"] == "404"
+    assert payload["detail"] == "Not Found"
+
+
+def test_head_error_matches_get_content_length(mock_settings: MockSettings) -> None:
+    """HEAD error responses advertise GET's Content-Length with an empty body."""
+    with patch("src.api.app.settings", mock_settings):
+        client = TestClient(_create_fastapi_app())
+    get_response = client.get("/does-not-exist")
+    head_response = client.head("/does-not-exist")
+    assert head_response.status_code == 404
+    assert head_response.content == b""
+    assert (
+        head_response.headers["content-length"]
+        == get_response.headers["content-length"]
+        == str(len(get_response.content))
+    )
+
+
 def test_prometheus_disabled_package_available(mock_settings: MockSettings) -> None:
     """Test app creation when Prometheus is disabled but package is available."""
     mock_settings.prometheus_enabled = False
@@ -6,7 +6,7 @@ import pytest
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.testclient import TestClient
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from src.api.app import app as main_app  # Import the main app instance
 from src.api.errors import (
@@ -24,6 +24,16 @@ class DummyModel(BaseModel):
     name: str = Field(..., min_length=3)
 
 
+class StrictModel(BaseModel):
+    code: str
+
+    @field_validator("code")
+    @classmethod
+    def _reject(cls, v: str) -> str:
+        # ValueError instances end up in the error ``ctx`` – not JSON-native.
+        raise ValueError("code is not accepted")
+
+
 @pytest.fixture
 def test_app(mock_settings: MockSettings) -> FastAPI:
     """Creates a minimal FastAPI app instance for testing error handlers directly."""
@@ -43,6 +53,10 @@ def test_app(mock_settings: MockSettings) -> FastAPI:
     async def cause_validation_error(item: DummyModel):
         return {"name": item.name}
 
+    @temp_app.post("/validation_ctx")
+    async def cause_validation_ctx_error(item: StrictModel):
+        return {"code": item.code}
+
     @temp_app.get("/http_exception")
     async def cause_http_exception():
         raise HTTPException(status_code=403, detail="Forbidden access")
@@ -83,6 +97,15 @@ def test_validation_error_handler(client: TestClient) -> None:
     )
 
 
+def test_validation_error_handler_non_json_ctx(client: TestClient) -> None:
+    """Validation errors carrying exception objects in ``ctx`` still render."""
+    response = client.post("/validation_ctx", json={"code": "x"})
+
+    assert response.status_code == 422
+    details = response.json()["error"]["details"]
+    assert details[0]["ctx"]["error"] == "code is not accepted"
+
+
 def test_http_exception_handler(client: TestClient) -> None:
     """Test the response for standard FastAPI/Starlette HTTPErrors."""
     response = client.get("/http_exception")
@@ -90,7 +113,7 @@ def test_http_exception_handler(client: TestClient) -> None:
     assert response.status_code == 403
     payload = response.json()
     assert "error" in payload
-    assert payload["error"]["code"] == 403
+    assert payload["error"]["code"] == "403"
     assert payload["error"]["message"] == "Forbidden access"
     # The specific handler also adds a top-level 'detail' key
     assert payload["detail"] == "Forbidden access"
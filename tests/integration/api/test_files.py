@@ -269,7 +269,7 @@ def test_upload_with_validation_error_raised_by_route_validator(
         response = client.post("/v1/files", files=files_payload, headers=headers)
         assert response.status_code == 415
         payload = response.json()
-        assert payload["error"]["code"] == 415
+        assert payload["error"]["code"] == "415"
         assert payload["error"]["message"] == "Custom validator error: Deliberate fail."
         assert payload["error"]["request_id"] == headers["X-Request-ID"]
 
@@ -356,6 +356,7 @@ def test_files_route_redis_connection_error_on_async(
 
         assert response.status_code == 503
         payload = response.json()
+        assert payload["error"]["code"] == "503"
         assert "Redis connection failed for job creation" in payload["error"]["message"]
         assert payload["error"]["request_id"] == headers["X-Request-ID"]
         mock_create_job.assert_called_once()
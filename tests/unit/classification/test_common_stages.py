@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from io import BytesIO
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import re
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Awaitable, Callable, NamedTuple
+from unittest.mock import MagicMock, _Call, call, patch
 
 import pytest
-from starlette.datastructures import UploadFile
+from structlog.testing import CapturedCall, CapturingLogger
 
 from src.classification.model import ModelNotAvailableError
+from src.classification.stages import filename as filename_stage
+from src.classification.stages import metadata, ocr, text
 from src.classification.stages.filename import stage_filename
 from src.classification.stages.metadata import stage_metadata
 from src.classification.stages.ocr import stage_ocr
@@ -18,698 +24,900 @@ from pdfminer.psparser import PSException
 from pdfminer.pdfdocument import PDFTextExtractionNotAllowed
 from pdfminer.pdftypes import PDFException
 
+# Share one event loop across the module instead of one per test. Under
+# ``--dist=loadgroup`` the xdist group keeps the module on one worker so the
+# module-scoped fixtures and event loop are set up once, not once per worker.
+# Workers are separate processes, so this is about setup cost, not isolation.
+pytestmark = [
+    pytest.mark.asyncio(loop_scope="module"),
+    pytest.mark.xdist_group("stage_mocks"),
+]
+
+
+@dataclass
+class StagePatches:
+    """Handles to the mocks installed on the text and OCR stage modules."""
+
+    text_predict: MagicMock
+    text_logger: MagicMock
+    ocr_predict: MagicMock
+    ocr_logger: MagicMock
+
+    def reset(self) -> None:
+        for mock in (
+            self.text_predict,
+            self.text_logger,
+            self.ocr_predict,
+            self.ocr_logger,
+        ):
+            mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="module")
+def _module_stage_patches():
+    """Patch ``predict``, ``_MODEL_AVAILABLE`` and ``logger`` once per module."""
+    handles = StagePatches(
+        text_predict=MagicMock(),
+        text_logger=MagicMock(),
+        ocr_predict=MagicMock(),
+        ocr_logger=MagicMock(),
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(text, "predict", handles.text_predict)
+        mp.setattr(text, "_MODEL_AVAILABLE", True)
+        mp.setattr(text, "logger", handles.text_logger)
+        mp.setattr(ocr, "predict", handles.ocr_predict)
+        mp.setattr(ocr, "_MODEL_AVAILABLE", True)
+        mp.setattr(ocr, "logger", handles.ocr_logger)
+        yield handles
+
+
+@pytest.fixture(autouse=True)
+def stage_patches(_module_stage_patches: StagePatches) -> StagePatches:
+    """Per-test view of the module patches with call history cleared."""
+    _module_stage_patches.reset()
+    return _module_stage_patches
+
+
+# Expected stage confidences, built once and compared by equality.
+_APPROX_86 = pytest.approx(0.86)
+_APPROX_88 = pytest.approx(0.88)
+_APPROX_91 = pytest.approx(0.91)
+_APPROX_75 = pytest.approx(0.75)
+_APPROX_72 = pytest.approx(0.72)
+
+# Extracted text for the no-match tests and the previews the stages log for it.
+_TEXT_PREVIEW = "unique text no keywords"
+_TEXT_PREVIEW_100 = _TEXT_PREVIEW[:100]
+_OCR_PREVIEW = "very unique ocr content"
+_OCR_PREVIEW_100 = _OCR_PREVIEW[:100]
+
+# Expected log calls with fixed arguments, keyed by event name. Metadata stage
+# calls are compared against the ``metadata_logs`` CapturingLogger.
+_EXPECTED_METADATA_LOGS: dict[str, CapturedCall] = {
+    "metadata_stage_io_error": CapturedCall(
+        "error",
+        ("metadata_stage_io_error",),
+        {"filename": "error.pdf", "error": "Simulated read error", "exc_info": True},
+    ),
+    "metadata_stage_processing_error": CapturedCall(
+        "error",
+        ("metadata_stage_processing_error",),
+        {
+            "filename": "error.pdf",
+            "error": "Internal extraction boom",
+            "exc_info": True,
+        },
+    ),
+    "metadata_stage_no_metadata": CapturedCall(
+        "debug", ("metadata_stage_no_metadata",), {"filename": "worker_error.pdf"}
+    ),
+}
+
+# Text/OCR stage calls are compared against the module-scoped MagicMock
+# loggers' ``call_args_list``.
+_EXPECTED_MOCK_LOGS: dict[str, _Call] = {
+    "text_stage_model_prediction": call(
+        "text_stage_model_prediction",
+        filename="invoice.pdf",
+        label="invoice_model",
+        confidence=0.88,
+    ),
+    "text_stage_model_not_available": call(
+        "text_stage_model_not_available",
+        filename="statement.csv",
+        fallback="heuristics",
+    ),
+    "text_stage_heuristic_match": call(
+        "text_stage_heuristic_match",
+        filename="statement.csv",
+        label="bank_statement",
+        confidence=0.75,
+    ),
+    "text_stage_model_no_prediction": call(
+        "text_stage_model_no_prediction",
+        filename="nomatch.txt",
+        text_preview=_TEXT_PREVIEW_100,
+    ),
+    "text_stage_no_match": call(
+        "text_stage_no_match", filename="nomatch.txt", text_preview=_TEXT_PREVIEW_100
+    ),
+    "ocr_stage_model_prediction": call(
+        "ocr_stage_model_prediction",
+        filename="license.png",
+        label="drivers_licence_model",
+        confidence=0.91,
+    ),
+    "ocr_stage_model_not_available": call(
+        "ocr_stage_model_not_available", filename="photo_id.jpg", fallback="heuristics"
+    ),
+    "ocr_stage_heuristic_match": call(
+        "ocr_stage_heuristic_match",
+        filename="photo_id.jpg",
+        label="form",
+        confidence=0.72,
+    ),
+    "ocr_stage_model_no_prediction": call(
+        "ocr_stage_model_no_prediction",
+        filename="nomatch.jpg",
+        text_preview=_OCR_PREVIEW_100,
+    ),
+    "ocr_stage_no_match": call(
+        "ocr_stage_no_match", filename="nomatch.jpg", text_preview=_OCR_PREVIEW_100
+    ),
+}
+
+_PDF_CONTENT = b"pdf_content"
+_BAD_PDF = b"bad_pdf"
+_IMG = b"img_content"
+
+
+class _AsyncStub:
+    """Async callable that returns or raises a fixed value and records calls."""
+
+    __slots__ = ("_result", "_exc", "calls")
+
+    def __init__(self, result: Any = None, exc: Exception | None = None) -> None:
+        self._result = result
+        self._exc = exc
+        self.calls: list[tuple[Any, ...]] = []
+
+    async def __call__(self, *args: Any) -> Any:
+        self.calls.append(args)
+        if self._exc is not None:
+            raise self._exc
+        return self._result
+
+
+def _returner(value: Any) -> _AsyncStub:
+    return _AsyncStub(result=value)
+
+
+def _raiser(exc: Exception) -> _AsyncStub:
+    return _AsyncStub(exc=exc)
+
+
+class _FakeUpload:
+    """Minimal stand-in for ``UploadFile`` used by the stage tests.
+
+    ``read`` and ``seek`` are plain coroutines that record their calls, which
+    is all the stages need and avoids ``AsyncMock`` machinery per test.
+    ``read`` hands back the content object itself, without copying. With
+    ``with_io=False`` only the name and content type are set, so any I/O
+    access fails loudly with ``AttributeError``.
+    """
+
+    __slots__ = (
+        "filename",
+        "content_type",
+        "_content",
+        "read_calls",
+        "seek_calls",
+        "read_error",
+    )
+
+    def __init__(
+        self,
+        filename: str | None,
+        content: bytes = b"",
+        content_type: str | None = None,
+        *,
+        with_io: bool = True,
+    ) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        if not with_io:
+            return
+        self._content = content
+        self.read_calls = 0
+        self.seek_calls: list[int] = []
+        self.read_error: Exception | None = None
+
+    async def read(self, size: int = -1) -> bytes:
+        self.read_calls += 1
+        if self.read_error is not None:
+            raise self.read_error
+        return self._content
+
+    async def seek(self, offset: int) -> None:
+        self.seek_calls.append(offset)
+
 
 @pytest.fixture
-def mock_upload_file_factory():
-    """Factory to create mock UploadFile objects for testing stages."""
+def metadata_logs(monkeypatch: pytest.MonkeyPatch) -> CapturingLogger:
+    """Record the metadata stage's log calls in place of its structlog logger."""
+    logs = CapturingLogger()
+    monkeypatch.setattr(metadata, "logger", logs)
+    return logs
 
-    def _factory(
-        filename: str, content: bytes, content_type: str | None = None
-    ) -> MagicMock:
-        mock_file = MagicMock(spec=UploadFile)
-        mock_file.filename = filename
-        mock_file.content_type = content_type
 
-        # Mock the file-like object within UploadFile
-        mock_file.file = BytesIO(content)  # Use BytesIO for seek/read
-        # For stages that might use async seek/read on UploadFile itself
-        mock_file.seek = AsyncMock()
-        mock_file.read = AsyncMock(return_value=content)
-        return mock_file
+class StageMocks(NamedTuple):
+    """Mocks wired into one stage module by ``arm_stage``."""
 
-    return _factory
+    parser: _AsyncStub
+    predict: MagicMock
+    logger: MagicMock
 
 
-# Test Filename Stage
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "filename, expected_label, expected_confidence_range",
-    [
-        ("invoice_123.pdf", "invoice", (0.80, 0.95)),
-        ("my_bank_statement.docx", "bank_statement", (0.80, 0.95)),
-        ("financial_report_final.xlsx", "financial_report", (0.80, 0.95)),
-        ("drivers_license_scan.jpg", "drivers_licence", (0.80, 0.95)),
-        ("id_card_john_doe.png", "id_doc", (0.80, 0.95)),
-        ("service_agreement.pdf", "contract", (0.80, 0.95)),
-        ("important_email.eml", "email", (0.80, 0.95)),  # .eml specific check
-        ("application_form_v2.pdf", "form", (0.80, 0.95)),
-        ("unknown_document.dat", None, None),
-        ("", None, None),  # Empty filename
-        (None, None, None),  # None filename
-        ("path/to/invoice.pdf", "invoice", (0.80, 0.95)),  # With path
-        ("INV001.pdf", "invoice", (0.80, 0.95)),  # Strong start
-    ],
-)
-async def test_stage_filename(
-    filename: str | None,  # Allow None
-    expected_label: str | None,
-    expected_confidence_range: tuple[float, float] | None,
-    mock_upload_file_factory,
-) -> None:
-    """Tests the filename stage with various inputs."""
-    # Handle None filename case for factory
-    if filename is None:
-        mock_file = mock_upload_file_factory(
-            "dummy", b"dummy", "application/octet-stream"
-        )
-        mock_file.filename = None  # Explicitly set to None after creation
-    else:
-        mock_file = mock_upload_file_factory(
-            filename, b"dummy", "application/octet-stream"
-        )
+_EXTRACTOR_REGISTRIES = {text: "TEXT_EXTRACTORS", ocr: "IMAGE_EXTRACTORS"}
 
-    outcome = await stage_filename(mock_file)
 
-    assert outcome.label == expected_label
-    if expected_confidence_range and outcome.confidence is not None:
-        assert (
-            expected_confidence_range[0]
-            <= outcome.confidence
-            <= expected_confidence_range[1]
-        )
-    else:
-        assert outcome.confidence is None
+@pytest.fixture
+def arm_stage(
+    monkeypatch: pytest.MonkeyPatch, stage_patches: StagePatches
+) -> Callable[..., StageMocks]:
+    """Register a parser on a stage module and configure its ``predict`` in one call."""
+
+    def _arm(
+        mod: ModuleType,
+        ext: str,
+        parser: _AsyncStub,
+        *,
+        predict: tuple[str | None, float | None] | None = None,
+        predict_exc: Exception | None = None,
+    ) -> StageMocks:
+        monkeypatch.setitem(getattr(mod, _EXTRACTOR_REGISTRIES[mod]), ext, parser)
+        if mod is text:
+            predict_mock, logger_mock = (
+                stage_patches.text_predict,
+                stage_patches.text_logger,
+            )
+        else:
+            predict_mock, logger_mock = (
+                stage_patches.ocr_predict,
+                stage_patches.ocr_logger,
+            )
+        predict_mock.return_value = predict
+        predict_mock.side_effect = predict_exc
+        return StageMocks(parser, predict_mock, logger_mock)
+
+    return _arm
+
+
+@pytest.fixture(scope="session")
+def mock_upload_file_factory():
+    """Factory to create fake UploadFile objects for testing stages."""
+    return _FakeUpload
+
+
+# Test Filename Stage
+# (filename, expected_label, expected_confidence_range)
+_FILENAME_CASES: list[tuple[str | None, str | None, tuple[float, float] | None]] = [
+    ("invoice_123.pdf", "invoice", (0.80, 0.95)),
+    ("my_bank_statement.docx", "bank_statement", (0.80, 0.95)),
+    ("financial_report_final.xlsx", "financial_report", (0.80, 0.95)),
+    ("drivers_license_scan.jpg", "drivers_licence", (0.80, 0.95)),
+    ("id_card_john_doe.png", "id_doc", (0.80, 0.95)),
+    ("service_agreement.pdf", "contract", (0.80, 0.95)),
+    ("important_email.eml", "email", (0.80, 0.95)),  # .eml specific check
+    ("application_form_v2.pdf", "form", (0.80, 0.95)),
+    ("unknown_document.dat", None, None),
+    ("", None, None),  # Empty filename
+    (None, None, None),  # None filename
+    ("path/to/invoice.pdf", "invoice", (0.80, 0.95)),  # With path
+    ("INV001.pdf", "invoice", (0.80, 0.95)),  # Strong start
+    ("form_invoice.pdf", "invoice", (0.80, 0.95)),  # Pattern order wins
+    ("bank\nstate.pdf", None, None),  # Pattern "." does not cross newlines
+    ("scan\ninvoice.pdf", "invoice", (0.80, 0.95)),  # Match after a newline
+]
+
+
+async def test_stage_filename(mock_upload_file_factory) -> None:
+    """Tests the filename stage with various inputs in one batch."""
+    # stage_filename only looks at .filename, so skip the I/O state
+    files = [
+        mock_upload_file_factory(filename, with_io=False)
+        for filename, _, _ in _FILENAME_CASES
+    ]
+
+    outcomes = await asyncio.gather(*(stage_filename(f) for f in files))
+
+    # The label patterns are compiled once at import, not per call
+    assert isinstance(filename_stage._FILENAME_PATTERN, re.Pattern)
+
+    for (filename, expected_label, expected_confidence_range), outcome in zip(
+        _FILENAME_CASES, outcomes, strict=True
+    ):
+        assert outcome.label == expected_label, filename
+        if expected_confidence_range and outcome.confidence is not None:
+            assert (
+                expected_confidence_range[0]
+                <= outcome.confidence
+                <= expected_confidence_range[1]
+            ), filename
+        else:
+            assert outcome.confidence is None, filename
 
 
 # Test Metadata Stage
-@pytest.mark.asyncio
 async def test_stage_metadata_pdf_match(mock_upload_file_factory) -> None:
     """Tests metadata stage with a PDF that has matching metadata."""
     mock_file = mock_upload_file_factory(
-        "meta_invoice.pdf", b"pdf_content", "application/pdf"
+        "meta_invoice.pdf", _PDF_CONTENT, "application/pdf"
     )
 
     with patch(
         "src.classification.stages.metadata._extract_pdf_metadata",
-        AsyncMock(return_value="This is an Invoice"),
+        _returner("This is an Invoice"),
     ) as mock_extract:
         outcome = await stage_metadata(mock_file)
         # Ensure _extract_pdf_metadata is called with content AND filename
-        mock_extract.assert_called_once_with(b"pdf_content", "meta_invoice.pdf")
+        assert mock_extract.calls == [(b"pdf_content", "meta_invoice.pdf")]
         assert outcome.label == "invoice"
-        assert outcome.confidence == pytest.approx(0.86)
+        assert outcome.confidence == _APPROX_86
 
 
-@pytest.mark.asyncio
 async def test_stage_metadata_pdf_no_match(mock_upload_file_factory) -> None:
     """Tests metadata stage with a PDF that has no matching metadata."""
     mock_file = mock_upload_file_factory(
-        "other_doc.pdf", b"pdf_content", "application/pdf"
+        "other_doc.pdf", _PDF_CONTENT, "application/pdf"
     )
     with patch(
         "src.classification.stages.metadata._extract_pdf_metadata",
-        AsyncMock(return_value="Generic document info"),
+        _returner("Generic document info"),
     ) as mock_extract:
         outcome = await stage_metadata(mock_file)
         # Ensure _extract_pdf_metadata is called with content AND filename
-        mock_extract.assert_called_once_with(b"pdf_content", "other_doc.pdf")
+        assert mock_extract.calls == [(b"pdf_content", "other_doc.pdf")]
         assert outcome.label is None
         assert outcome.confidence is None
 
 
-@pytest.mark.asyncio
 async def test_stage_metadata_not_pdf(mock_upload_file_factory) -> None:
     """Tests metadata stage with a non-PDF file, should skip."""
     mock_file = mock_upload_file_factory("document.txt", b"text_content", "text/plain")
     with patch(
         "src.classification.stages.metadata._extract_pdf_metadata",
-        new_callable=AsyncMock,
+        _returner(""),
     ) as mock_extract:
         outcome = await stage_metadata(mock_file)
-        mock_extract.assert_not_called()
+        assert not mock_extract.calls
         assert outcome.label is None
         assert outcome.confidence is None
 
 
-@pytest.mark.asyncio
 async def test_stage_metadata_pdf_extraction_fails(mock_upload_file_factory) -> None:
     """Tests metadata stage when PDF metadata extraction returns empty string (simulating failure)."""
-    mock_file = mock_upload_file_factory("corrupt.pdf", b"bad_pdf", "application/pdf")
+    mock_file = mock_upload_file_factory("corrupt.pdf", _BAD_PDF, "application/pdf")
     with patch(
         "src.classification.stages.metadata._extract_pdf_metadata",
-        AsyncMock(return_value=""),
+        _returner(""),
     ) as mock_extract:
         outcome = await stage_metadata(mock_file)
         # Ensure _extract_pdf_metadata is called with content AND filename
-        mock_extract.assert_called_once_with(b"bad_pdf", "corrupt.pdf")
+        assert mock_extract.calls == [(b"bad_pdf", "corrupt.pdf")]
         assert outcome.label is None
         assert outcome.confidence is None
 
 
-@pytest.mark.asyncio
-async def test_stage_metadata_processing_error(mock_upload_file_factory) -> None:
-    """Tests metadata stage handles generic exception during processing by raising MetadataProcessingError."""
-    mock_file = mock_upload_file_factory("error.pdf", b"pdf_content", "application/pdf")
-    # Mock file read to raise an exception, which should be wrapped in MetadataProcessingError
-    mock_file.read = AsyncMock(side_effect=OSError("Simulated read error"))
+async def test_stage_metadata_io_error(
+    mock_upload_file_factory, metadata_logs: CapturingLogger
+) -> None:
+    """Tests metadata stage wraps a file read failure in MetadataProcessingError."""
+    mock_file = mock_upload_file_factory("error.pdf", _PDF_CONTENT, "application/pdf")
+    # Make file read raise an exception, which should be wrapped in MetadataProcessingError
+    mock_file.read_error = OSError("Simulated read error")
 
-    with patch("src.classification.stages.metadata.logger") as mock_logger:
-        with pytest.raises(MetadataProcessingError) as excinfo:
-            await stage_metadata(mock_file)
+    with pytest.raises(MetadataProcessingError) as excinfo:
+        await stage_metadata(mock_file)
 
-        assert "File I/O error in metadata stage: Simulated read error" in str(
-            excinfo.value
-        )
-        # Check that the error was logged
-        mock_logger.error.assert_called_once_with(
-            "metadata_stage_io_error",  # Updated to match the new specific log event
-            filename="error.pdf",
-            error="Simulated read error",
-            exc_info=True,
-        )
+    assert "File I/O error in metadata stage: Simulated read error" in str(
+        excinfo.value
+    )
+    # Check that the error was logged
+    assert metadata_logs.calls == [_EXPECTED_METADATA_LOGS["metadata_stage_io_error"]]
 
-    # Test with a generic exception from _extract_pdf_metadata
-    mock_file.read = AsyncMock(return_value=b"pdf_content")  # Reset read mock
-    with (
-        patch(
-            "src.classification.stages.metadata._extract_pdf_metadata",
-            AsyncMock(side_effect=Exception("Internal extraction boom")),
-        ) as mock_extract_boom,
-        patch("src.classification.stages.metadata.logger") as mock_logger_boom,
-    ):
+
+async def test_stage_metadata_internal_extraction_error(
+    mock_upload_file_factory, metadata_logs: CapturingLogger
+) -> None:
+    """Tests metadata stage wraps a generic _extract_pdf_metadata failure."""
+    mock_file = mock_upload_file_factory("error.pdf", _PDF_CONTENT, "application/pdf")
+
+    with patch(
+        "src.classification.stages.metadata._extract_pdf_metadata",
+        _raiser(Exception("Internal extraction boom")),
+    ) as mock_extract_boom:
         with pytest.raises(MetadataProcessingError) as excinfo_boom:
             await stage_metadata(mock_file)
         assert (
             "General processing error in metadata stage: Internal extraction boom"
             in str(excinfo_boom.value)
         )
-        mock_extract_boom.assert_called_once_with(b"pdf_content", "error.pdf")
+        assert mock_extract_boom.calls == [(b"pdf_content", "error.pdf")]
         # This log comes from the except Exception block in stage_metadata
-        mock_logger_boom.error.assert_called_once_with(
-            "metadata_stage_processing_error",
-            filename="error.pdf",
-            error="Internal extraction boom",
-            exc_info=True,
+        assert metadata_logs.calls == [
+            _EXPECTED_METADATA_LOGS["metadata_stage_processing_error"]
+        ]
+
+
+async def _expect_pdfminer_warning(
+    mock_file: _FakeUpload,
+    logs: CapturingLogger,
+    mock_pdfminer_extract: MagicMock,
+    exc: Exception,
+) -> None:
+    # Specific pdfminer errors: the worker logs a warning and returns ""
+    outcome = await stage_metadata(mock_file)
+    assert outcome.label is None
+    assert outcome.confidence is None
+    mock_pdfminer_extract.assert_called_once()
+    assert logs.calls == [
+        CapturedCall(
+            "warning",
+            ("pdf_metadata_extraction_failed_pdfminer",),
+            {
+                "filename": "worker_error.pdf",
+                "error": str(exc),
+                "error_type": type(exc).__name__,
+            },
+        ),
+        _EXPECTED_METADATA_LOGS["metadata_stage_no_metadata"],
+    ]
+
+
+async def _expect_extraction_denied(
+    mock_file: _FakeUpload,
+    logs: CapturingLogger,
+    mock_pdfminer_extract: MagicMock,
+    exc: Exception,
+) -> None:
+    outcome = await stage_metadata(mock_file)
+    assert outcome.label is None
+    assert outcome.confidence is None
+    mock_pdfminer_extract.assert_called_once()
+    assert logs.calls == [
+        CapturedCall(
+            "warning",
+            ("pdf_metadata_extraction_denied",),
+            {"filename": "worker_error.pdf"},
+        ),
+        _EXPECTED_METADATA_LOGS["metadata_stage_no_metadata"],
+    ]
+
+
+async def _expect_generic_raise(
+    mock_file: _FakeUpload,
+    logs: CapturingLogger,
+    mock_pdfminer_extract: MagicMock,
+    exc: Exception,
+) -> None:
+    # Generic exceptions: the worker raises MetadataProcessingError
+    with pytest.raises(MetadataProcessingError) as excinfo:
+        await stage_metadata(mock_file)
+    assert f"Unexpected error in PDF metadata worker: {exc}" in str(excinfo.value)
+    assert logs.calls == [
+        CapturedCall(
+            "error",
+            ("pdf_metadata_extraction_unexpected_error",),
+            {"filename": "worker_error.pdf", "error": str(exc), "exc_info": True},
         )
+    ]
+
+
+_WORKER_ERROR_HANDLERS = {
+    "warn_pdfminer": _expect_pdfminer_warning,
+    "warn_denied": _expect_extraction_denied,
+    "raise_generic": _expect_generic_raise,
+}
 
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "exception_type",
+    "exception_type, kind",
     [
-        PDFSyntaxError("bad syntax"),
-        PSException("postscript error"),
-        PDFException("pdf issue"),
-        PDFTextExtractionNotAllowed("extraction not allowed"),
-        Exception("generic worker error"),
+        (PDFSyntaxError("bad syntax"), "warn_pdfminer"),
+        (PSException("postscript error"), "warn_pdfminer"),
+        (PDFException("pdf issue"), "warn_pdfminer"),
+        (PDFTextExtractionNotAllowed("extraction not allowed"), "warn_denied"),
+        (Exception("generic worker error"), "raise_generic"),
     ],
 )
 async def test_stage_metadata_pdf_extraction_worker_errors(
     mock_upload_file_factory,
+    metadata_logs: CapturingLogger,
     exception_type: Exception,
+    kind: str,
 ) -> None:
     """Tests the worker function inside _extract_pdf_metadata handles specific PDF errors."""
     mock_file = mock_upload_file_factory(
-        "worker_error.pdf", b"bad_pdf", "application/pdf"
+        "worker_error.pdf", _BAD_PDF, "application/pdf"
     )
 
     # We need to patch the *actual* pdfminer function called by the worker
-    with (
-        patch(
-            "src.classification.stages.metadata.extract_text",
-            side_effect=exception_type,
-        ) as mock_pdfminer_extract,
-        patch("src.classification.stages.metadata.logger") as mock_logger,
-    ):
-        if isinstance(exception_type, Exception) and not isinstance(
-            exception_type,
-            (PDFSyntaxError, PSException, PDFException, PDFTextExtractionNotAllowed),
-        ):
-            # For generic exceptions, the worker raises MetadataProcessingError
-            with pytest.raises(MetadataProcessingError) as excinfo:
-                await stage_metadata(mock_file)
-            assert (
-                "Unexpected error in PDF metadata worker: generic worker error"
-                in str(excinfo.value)
-            )
-            mock_logger.error.assert_called_once_with(
-                "pdf_metadata_extraction_unexpected_error",
-                filename="worker_error.pdf",
-                error="generic worker error",
-                exc_info=True,
-            )
-        else:
-            # For specific PDF errors, the worker logs a warning and returns empty string
-            outcome = await stage_metadata(mock_file)
-            assert outcome.label is None
-            assert outcome.confidence is None
-
-            # Check that the specific pdfminer function was called inside the worker thread
-            mock_pdfminer_extract.assert_called_once()
-
-            # Check for appropriate warning log based on exception type
-            if isinstance(exception_type, PDFTextExtractionNotAllowed):
-                mock_logger.warning.assert_called_once_with(
-                    "pdf_metadata_extraction_denied", filename="worker_error.pdf"
-                )
-            else:
-                mock_logger.warning.assert_called_once_with(
-                    "pdf_metadata_extraction_failed_pdfminer",
-                    filename="worker_error.pdf",
-                    error=str(exception_type),
-                    error_type=type(exception_type).__name__,
-                )
+    with patch(
+        "src.classification.stages.metadata.extract_text",
+        side_effect=exception_type,
+    ) as mock_pdfminer_extract:
+        await _WORKER_ERROR_HANDLERS[kind](
+            mock_file, metadata_logs, mock_pdfminer_extract, exception_type
+        )
 
 
-@pytest.mark.asyncio
 async def test_stage_metadata_pdf_empty_or_whitespace_metadata(
     mock_upload_file_factory,
 ) -> None:
     """Tests metadata stage handles empty or whitespace-only metadata."""
     mock_file = mock_upload_file_factory(
-        "empty_meta.pdf", b"pdf_content", "application/pdf"
+        "empty_meta.pdf", _PDF_CONTENT, "application/pdf"
     )
 
     for metadata_value in ["", "   \n "]:
         with patch(
             "src.classification.stages.metadata._extract_pdf_metadata",
-            AsyncMock(return_value=metadata_value),
+            _returner(metadata_value),
         ) as mock_extract:
             outcome = await stage_metadata(mock_file)
-            mock_extract.assert_called_once_with(b"pdf_content", "empty_meta.pdf")
+            assert mock_extract.calls == [(b"pdf_content", "empty_meta.pdf")]
             assert outcome.label is None
             assert outcome.confidence is None
 
 
-@pytest.mark.asyncio
 async def test_stage_metadata_reraises_metadata_processing_error_from_worker(
-    mock_upload_file_factory,
+    mock_upload_file_factory, metadata_logs: CapturingLogger
 ) -> None:
     """Test that stage_metadata correctly re-raises MetadataProcessingError from worker."""
-    mock_file = mock_upload_file_factory(
-        "reraise.pdf", b"pdf_content", "application/pdf"
-    )
+    mock_file = mock_upload_file_factory("reraise.pdf", _PDF_CONTENT, "application/pdf")
     worker_exception = MetadataProcessingError("Worker-specific processing error")
 
-    with (
-        patch(
-            "src.classification.stages.metadata._extract_pdf_metadata",
-            AsyncMock(side_effect=worker_exception),
-        ) as mock_extract,
-        patch("src.classification.stages.metadata.logger") as mock_logger,
-    ):  # Mock logger to ensure it's NOT called for this re-raise path
+    with patch(
+        "src.classification.stages.metadata._extract_pdf_metadata",
+        _raiser(worker_exception),
+    ) as mock_extract:
         with pytest.raises(MetadataProcessingError) as excinfo:
             await stage_metadata(mock_file)
 
         assert (
             excinfo.value is worker_exception
         )  # Ensure the exact exception is re-raised
-        mock_extract.assert_called_once_with(b"pdf_content", "reraise.pdf")
-        mock_logger.error.assert_not_called()  # No new error should be logged by stage_metadata
-        mock_logger.warning.assert_not_called()
+        assert mock_extract.calls == [(b"pdf_content", "reraise.pdf")]
+        # Nothing should be logged by stage_metadata on this re-raise path
+        assert metadata_logs.calls == []
 
 
 # Test Text Stage
-@pytest.mark.asyncio
-async def test_stage_text_with_model(mock_upload_file_factory) -> None:
+async def test_stage_text_with_model(
+    mock_upload_file_factory,
+    arm_stage,
+) -> None:
     """Tests text stage when ML model is available and predicts."""
     mock_file = mock_upload_file_factory("invoice.pdf", b"content", "application/pdf")
-    mock_pdf_parser = AsyncMock(return_value="extracted invoice text")
-
-    # Patch the TEXT_EXTRACTORS within the text stage module
-    # Patch the imported 'predict' function within the text stage module
-    with (
-        patch.dict(
-            "src.classification.stages.text.TEXT_EXTRACTORS", {"pdf": mock_pdf_parser}
-        ),
-        patch("src.classification.stages.text._MODEL_AVAILABLE", True),
-        patch(
-            "src.classification.stages.text.predict",
-            return_value=("invoice_model", 0.88),
-        ) as mock_model_predict,
-        patch("src.classification.stages.text.logger") as mock_logger,
-    ):
-        outcome = await stage_text(mock_file)
-
-        mock_file.seek.assert_called_once_with(0)
-        mock_pdf_parser.assert_called_once_with(mock_file)
-        mock_model_predict.assert_called_once_with("extracted invoice text")
-        assert outcome.label == "invoice_model"
-        assert outcome.confidence == pytest.approx(0.88)
-        mock_logger.debug.assert_any_call(
-            "text_stage_model_prediction",
-            filename="invoice.pdf",
-            label="invoice_model",
-            confidence=0.88,
-        )
+    mock_pdf_parser = _returner("extracted invoice text")
+
+    mocks = arm_stage(text, "pdf", mock_pdf_parser, predict=("invoice_model", 0.88))
+    outcome = await stage_text(mock_file)
+
+    assert mock_file.seek_calls == [0]
+    assert mocks.parser.calls == [(mock_file,)]
+    mocks.predict.assert_called_once_with("extracted invoice text")
+    assert outcome.label == "invoice_model"
+    assert outcome.confidence == _APPROX_88
+    assert (
+        _EXPECTED_MOCK_LOGS["text_stage_model_prediction"]
+        in mocks.logger.debug.call_args_list
+    )
 
 
-@pytest.mark.asyncio
 async def test_stage_text_model_unavailable_fallback_heuristic(
     mock_upload_file_factory,
+    arm_stage,
 ) -> None:
     """Tests text stage fallback to heuristics when model is unavailable."""
     mock_file = mock_upload_file_factory("statement.csv", b"content", "text/csv")
-    mock_csv_parser = AsyncMock(return_value="bank statement keywords here")
+    mock_csv_parser = _returner("bank statement keywords here")
 
-    # Patch 'predict' to raise ModelNotAvailableError
-    with (
-        patch.dict(
-            "src.classification.stages.text.TEXT_EXTRACTORS", {"csv": mock_csv_parser}
-        ),
-        patch(
-            "src.classification.stages.text._MODEL_AVAILABLE", True
-        ),  # Model is available
-        patch(
-            "src.classification.stages.text.predict",
-            side_effect=ModelNotAvailableError("Model not found"),
-        ) as mock_model_predict,
-        patch("src.classification.stages.text.logger") as mock_logger,
-    ):
-        outcome = await stage_text(mock_file)
-
-        mock_file.seek.assert_called_once_with(0)
-        mock_csv_parser.assert_called_once_with(mock_file)
-        mock_model_predict.assert_called_once_with(
-            "bank statement keywords here"
-        )  # Check predict was called
-        mock_logger.warning.assert_called_once_with(
-            "text_stage_model_not_available",
-            filename="statement.csv",
-            fallback="heuristics",
-        )
-        mock_logger.debug.assert_any_call(  # Check heuristic match logging
-            "text_stage_heuristic_match",
-            filename="statement.csv",
-            label="bank_statement",
-            confidence=0.75,
-        )
-        assert outcome.label == "bank_statement"  # From heuristic
-        assert outcome.confidence == pytest.approx(0.75)  # Fallback confidence
-
-
-@pytest.mark.asyncio
-async def test_stage_text_unsupported_extension(mock_upload_file_factory) -> None:
+    mocks = arm_stage(
+        text,
+        "csv",
+        mock_csv_parser,
+        predict_exc=ModelNotAvailableError("Model not found"),
+    )
+    outcome = await stage_text(mock_file)
+
+    assert mock_file.seek_calls == [0]
+    assert mocks.parser.calls == [(mock_file,)]
+    mocks.predict.assert_called_once_with(
+        "bank statement keywords here"
+    )  # Check predict was called
+    assert mocks.logger.warning.call_args_list == [
+        _EXPECTED_MOCK_LOGS["text_stage_model_not_available"]
+    ]
+    assert (
+        _EXPECTED_MOCK_LOGS["text_stage_heuristic_match"]
+        in mocks.logger.debug.call_args_list
+    )  # Check heuristic match logging
+    assert outcome.label == "bank_statement"  # From heuristic
+    assert outcome.confidence == _APPROX_75  # Fallback confidence
+
+
+async def test_stage_text_unsupported_extension(
+    mock_upload_file_factory, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Tests text stage with an unsupported text file extension."""
     mock_file = mock_upload_file_factory("archive.zip", b"content", "application/zip")
-    # Ensure TEXT_EXTRACTORS doesn't have 'zip' by patching it (or ensure default doesn't)
-    with patch.dict("src.classification.stages.text.TEXT_EXTRACTORS", {}, clear=True):
-        outcome = await stage_text(mock_file)
-        assert outcome.label is None
-        assert outcome.confidence is None
+    # Ensure TEXT_EXTRACTORS has no "zip" parser
+    monkeypatch.delitem(text.TEXT_EXTRACTORS, "zip", raising=False)
+    outcome = await stage_text(mock_file)
+    assert outcome.label is None
+    assert outcome.confidence is None
 
 
-@pytest.mark.asyncio
-async def test_stage_text_empty_extracted_text(mock_upload_file_factory) -> None:
+async def test_stage_text_empty_extracted_text(
+    mock_upload_file_factory, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Tests text stage when the parser returns empty text."""
     mock_file = mock_upload_file_factory("empty.txt", b"", "text/plain")
-    mock_txt_parser = AsyncMock(return_value="  ")  # Whitespace only
+    mock_txt_parser = _returner("  ")  # Whitespace only
 
-    with patch.dict(
-        "src.classification.stages.text.TEXT_EXTRACTORS", {"txt": mock_txt_parser}
-    ):
-        outcome = await stage_text(mock_file)
-        mock_file.seek.assert_called_once_with(0)
-        mock_txt_parser.assert_called_once_with(mock_file)
-        assert outcome.label is None
-        assert outcome.confidence is None
+    monkeypatch.setitem(text.TEXT_EXTRACTORS, "txt", mock_txt_parser)
+    outcome = await stage_text(mock_file)
+    assert mock_file.seek_calls == [0]
+    assert mock_txt_parser.calls == [(mock_file,)]
+    assert outcome.label is None
+    assert outcome.confidence is None
 
 
-@pytest.mark.asyncio
-async def test_stage_text_extraction_error(mock_upload_file_factory) -> None:
-    """Tests text stage handling of generic exception during text extraction."""
-    mock_file = mock_upload_file_factory("error.txt", b"content", "text/plain")
-    mock_txt_parser = AsyncMock(side_effect=Exception("Simulated extraction error"))
-
-    with (
-        patch.dict(
-            "src.classification.stages.text.TEXT_EXTRACTORS", {"txt": mock_txt_parser}
-        ),
-        patch("src.classification.stages.text.logger") as mock_logger,
-    ):
-        outcome = await stage_text(mock_file)
-
-        assert outcome.label is None
-        assert outcome.confidence is None
-        mock_logger.error.assert_called_once_with(
-            "text_stage_extraction_error",
-            filename="error.txt",
-            extension="txt",
-            error="Simulated extraction error",
-            exc_info=True,
-        )
-
-
-@pytest.mark.asyncio
-async def test_stage_text_model_prediction_error(mock_upload_file_factory) -> None:
-    """Tests text stage handling of generic exception during model prediction."""
-    mock_file = mock_upload_file_factory("predict_error.txt", b"content", "text/plain")
-    mock_txt_parser = AsyncMock(return_value="some text")
-
-    with (
-        patch.dict(
-            "src.classification.stages.text.TEXT_EXTRACTORS", {"txt": mock_txt_parser}
-        ),
-        patch("src.classification.stages.text._MODEL_AVAILABLE", True),
-        patch(
-            "src.classification.stages.text.predict",
-            side_effect=Exception("Simulated prediction error"),
-        ) as mock_model_predict,
-        patch("src.classification.stages.text.logger") as mock_logger,
-    ):
-        outcome = await stage_text(mock_file)
-
-        assert outcome.label is None
-        assert outcome.confidence is None
-        mock_model_predict.assert_called_once_with("some text")
-        mock_logger.error.assert_called_once_with(
-            "text_stage_model_prediction_error",
-            filename="predict_error.txt",
-            error="Simulated prediction error",
-            exc_info=True,
-        )
-
-
-@pytest.mark.asyncio
 async def test_stage_text_model_returns_none_fallback_no_heuristic_match(
     mock_upload_file_factory,
+    arm_stage,
 ) -> None:
     """Text stage: model returns (None, None), no heuristic match."""
     mock_file = mock_upload_file_factory("nomatch.txt", b"content", "text/plain")
-    mock_txt_parser = AsyncMock(return_value="unique text no keywords")
+    mock_txt_parser = _returner(_TEXT_PREVIEW)
 
-    with (
-        patch.dict(
-            "src.classification.stages.text.TEXT_EXTRACTORS", {"txt": mock_txt_parser}
-        ),
-        patch("src.classification.stages.text._MODEL_AVAILABLE", True),
-        patch(
-            "src.classification.stages.text.predict", return_value=(None, None)
-        ) as mock_model_predict,  # Model returns no prediction
-        patch("src.classification.stages.text.logger") as mock_logger,
-    ):
-        outcome = await stage_text(mock_file)
+    mocks = arm_stage(text, "txt", mock_txt_parser, predict=(None, None))
+    outcome = await stage_text(mock_file)
 
-        assert outcome.label is None
-        assert outcome.confidence is None
-        mock_model_predict.assert_called_once_with("unique text no keywords")
-        mock_logger.debug.assert_any_call(
-            "text_stage_model_no_prediction",
-            filename="nomatch.txt",
-            text_preview="unique text no keywords"[:100],
-        )
-        mock_logger.debug.assert_any_call(
-            "text_stage_no_match",
-            filename="nomatch.txt",
-            text_preview="unique text no keywords"[:100],
-        )
+    assert outcome.label is None
+    assert outcome.confidence is None
+    mocks.predict.assert_called_once_with(_TEXT_PREVIEW)
+    assert (
+        _EXPECTED_MOCK_LOGS["text_stage_model_no_prediction"]
+        in mocks.logger.debug.call_args_list
+    )
+    assert (
+        _EXPECTED_MOCK_LOGS["text_stage_no_match"] in mocks.logger.debug.call_args_list
+    )
 
 
 # Test OCR Stage
-@pytest.mark.asyncio
-async def test_stage_ocr_with_model(mock_upload_file_factory) -> None:
+async def test_stage_ocr_with_model(
+    mock_upload_file_factory,
+    arm_stage,
+) -> None:
     """Tests OCR stage when ML model is available and predicts."""
-    mock_file = mock_upload_file_factory("license.png", b"img_content", "image/png")
-    mock_image_parser = AsyncMock(return_value="ocr text drivers license")
-
-    # Patch the IMAGE_EXTRACTORS within the ocr stage module
-    # Patch the imported 'predict' function within the ocr stage module
-    with (
-        patch.dict(
-            "src.classification.stages.ocr.IMAGE_EXTRACTORS", {"png": mock_image_parser}
-        ),
-        patch("src.classification.stages.ocr._MODEL_AVAILABLE", True),
-        patch(
-            "src.classification.stages.ocr.predict",
-            return_value=("drivers_licence_model", 0.91),
-        ) as mock_model_predict,
-        patch("src.classification.stages.ocr.logger") as mock_logger,
-    ):
-        outcome = await stage_ocr(mock_file)
-
-        mock_file.seek.assert_called_once_with(0)
-        mock_image_parser.assert_called_once_with(mock_file)
-        mock_model_predict.assert_called_once_with("ocr text drivers license")
-        assert outcome.label == "drivers_licence_model"
-        assert outcome.confidence == pytest.approx(0.91)
-        mock_logger.debug.assert_any_call(
-            "ocr_stage_model_prediction",
-            filename="license.png",
-            label="drivers_licence_model",
-            confidence=0.91,
-        )
+    mock_file = mock_upload_file_factory("license.png", _IMG, "image/png")
+    mock_image_parser = _returner("ocr text drivers license")
+
+    mocks = arm_stage(
+        ocr, "png", mock_image_parser, predict=("drivers_licence_model", 0.91)
+    )
+    outcome = await stage_ocr(mock_file)
+
+    assert mock_file.seek_calls == [0]
+    assert mocks.parser.calls == [(mock_file,)]
+    mocks.predict.assert_called_once_with("ocr text drivers license")
+    assert outcome.label == "drivers_licence_model"
+    assert outcome.confidence == _APPROX_91
+    assert (
+        _EXPECTED_MOCK_LOGS["ocr_stage_model_prediction"]
+        in mocks.logger.debug.call_args_list
+    )
 
 
-@pytest.mark.asyncio
 async def test_stage_ocr_model_unavailable_fallback_heuristic(
     mock_upload_file_factory,
+    arm_stage,
 ) -> None:
     """Tests OCR stage fallback to heuristics when model is unavailable."""
-    mock_file = mock_upload_file_factory("photo_id.jpg", b"img_content", "image/jpeg")
-    mock_image_parser = AsyncMock(return_value="some form application text")
-
-    # Patch 'predict' to raise ModelNotAvailableError
-    with (
-        patch.dict(
-            "src.classification.stages.ocr.IMAGE_EXTRACTORS", {"jpg": mock_image_parser}
-        ),
-        patch(
-            "src.classification.stages.ocr._MODEL_AVAILABLE", True
-        ),  # Model is available
-        patch(
-            "src.classification.stages.ocr.predict",
-            side_effect=ModelNotAvailableError("Model not found"),
-        ) as mock_model_predict,
-        patch("src.classification.stages.ocr.logger") as mock_logger,
-    ):
-        outcome = await stage_ocr(mock_file)
-
-        mock_file.seek.assert_called_once_with(0)
-        mock_image_parser.assert_called_once_with(mock_file)
-        mock_model_predict.assert_called_once_with(
-            "some form application text"
-        )  # Check predict was called
-        mock_logger.warning.assert_called_once_with(
-            "ocr_stage_model_not_available",
-            filename="photo_id.jpg",
-            fallback="heuristics",
-        )
-        mock_logger.debug.assert_any_call(  # Check heuristic match logging
-            "ocr_stage_heuristic_match",
-            filename="photo_id.jpg",
-            label="form",
-            confidence=0.72,
-        )
-        assert outcome.label == "form"  # From heuristic
-        assert outcome.confidence == pytest.approx(0.72)  # Fallback confidence
-
-
-@pytest.mark.asyncio
-async def test_stage_ocr_unsupported_extension(mock_upload_file_factory) -> None:
+    mock_file = mock_upload_file_factory("photo_id.jpg", _IMG, "image/jpeg")
+    mock_image_parser = _returner("some form application text")
+
+    mocks = arm_stage(
+        ocr,
+        "jpg",
+        mock_image_parser,
+        predict_exc=ModelNotAvailableError("Model not found"),
+    )
+    outcome = await stage_ocr(mock_file)
+
+    assert mock_file.seek_calls == [0]
+    assert mocks.parser.calls == [(mock_file,)]
+    mocks.predict.assert_called_once_with(
+        "some form application text"
+    )  # Check predict was called
+    assert mocks.logger.warning.call_args_list == [
+        _EXPECTED_MOCK_LOGS["ocr_stage_model_not_available"]
+    ]
+    assert (
+        _EXPECTED_MOCK_LOGS["ocr_stage_heuristic_match"]
+        in mocks.logger.debug.call_args_list
+    )  # Check heuristic match logging
+    assert outcome.label == "form"  # From heuristic
+    assert outcome.confidence == _APPROX_72  # Fallback confidence
+
+
+async def test_stage_ocr_unsupported_extension(
+    mock_upload_file_factory, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Tests OCR stage with an unsupported image file extension."""
     mock_file = mock_upload_file_factory(
-        "document.pdf", b"pdf_content", "application/pdf"
+        "document.pdf", _PDF_CONTENT, "application/pdf"
     )
     # Ensure IMAGE_EXTRACTORS doesn't have 'pdf'
-    with patch.dict("src.classification.stages.ocr.IMAGE_EXTRACTORS", {}, clear=True):
-        outcome = await stage_ocr(mock_file)
-        assert outcome.label is None
-        assert outcome.confidence is None
+    monkeypatch.delitem(ocr.IMAGE_EXTRACTORS, "pdf", raising=False)
+    outcome = await stage_ocr(mock_file)
+    assert outcome.label is None
+    assert outcome.confidence is None
 
 
-@pytest.mark.asyncio
-async def test_stage_ocr_empty_extracted_text(mock_upload_file_factory) -> None:
+async def test_stage_ocr_empty_extracted_text(
+    mock_upload_file_factory, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Tests OCR stage when the image parser (OCR) returns empty text."""
-    mock_file = mock_upload_file_factory("blank_image.png", b"img_content", "image/png")
-    mock_image_parser = AsyncMock(return_value="\n \t ")  # Whitespace only
-
-    with patch.dict(
-        "src.classification.stages.ocr.IMAGE_EXTRACTORS", {"png": mock_image_parser}
-    ):
-        outcome = await stage_ocr(mock_file)
-        mock_file.seek.assert_called_once_with(0)
-        mock_image_parser.assert_called_once_with(mock_file)
-        assert outcome.label is None
-        assert outcome.confidence is None
+    mock_file = mock_upload_file_factory("blank_image.png", _IMG, "image/png")
+    mock_image_parser = _returner("\n \t ")  # Whitespace only
 
+    monkeypatch.setitem(ocr.IMAGE_EXTRACTORS, "png", mock_image_parser)
+    outcome = await stage_ocr(mock_file)
+    assert mock_file.seek_calls == [0]
+    assert mock_image_parser.calls == [(mock_file,)]
+    assert outcome.label is None
+    assert outcome.confidence is None
 
-@pytest.mark.asyncio
-async def test_stage_ocr_extraction_error(mock_upload_file_factory) -> None:
-    """Tests OCR stage handling of generic exception during OCR extraction."""
-    mock_file = mock_upload_file_factory("error.jpg", b"img_content", "image/jpeg")
-    mock_image_parser = AsyncMock(side_effect=Exception("Simulated OCR error"))
 
-    with (
-        patch.dict(
-            "src.classification.stages.ocr.IMAGE_EXTRACTORS", {"jpg": mock_image_parser}
-        ),
-        patch("src.classification.stages.ocr.logger") as mock_logger,
-    ):
-        outcome = await stage_ocr(mock_file)
-
-        assert outcome.label is None
-        assert outcome.confidence is None
-        mock_logger.error.assert_called_once_with(
-            "ocr_stage_extraction_error",
-            filename="error.jpg",
-            extension="jpg",
-            error="Simulated OCR error",
-            exc_info=True,
-        )
-
-
-@pytest.mark.asyncio
-async def test_stage_ocr_model_prediction_error(mock_upload_file_factory) -> None:
-    """Tests OCR stage handling of generic exception during model prediction."""
-    mock_file = mock_upload_file_factory(
-        "predict_error.png", b"img_content", "image/png"
-    )
-    mock_image_parser = AsyncMock(return_value="some ocr text")
-
-    with (
-        patch.dict(
-            "src.classification.stages.ocr.IMAGE_EXTRACTORS", {"png": mock_image_parser}
-        ),
-        patch("src.classification.stages.ocr._MODEL_AVAILABLE", True),
-        patch(
-            "src.classification.stages.ocr.predict",
-            side_effect=Exception("Simulated prediction error"),
-        ) as mock_model_predict,
-        patch("src.classification.stages.ocr.logger") as mock_logger,
-    ):
-        outcome = await stage_ocr(mock_file)
-
-        assert outcome.label is None
-        assert outcome.confidence is None
-        mock_model_predict.assert_called_once_with("some ocr text")
-        mock_logger.error.assert_called_once_with(
-            "ocr_stage_model_prediction_error",
-            filename="predict_error.png",
-            error="Simulated prediction error",
-            exc_info=True,
-        )
-
-
-@pytest.mark.asyncio
 async def test_stage_ocr_model_returns_none_fallback_no_heuristic_match(
     mock_upload_file_factory,
+    arm_stage,
 ) -> None:
     """OCR stage: model returns (None, None), no heuristic match."""
-    mock_file = mock_upload_file_factory("nomatch.jpg", b"img_content", "image/jpeg")
-    mock_image_parser = AsyncMock(return_value="very unique ocr content")
+    mock_file = mock_upload_file_factory("nomatch.jpg", _IMG, "image/jpeg")
+    mock_image_parser = _returner(_OCR_PREVIEW)
+
+    mocks = arm_stage(ocr, "jpg", mock_image_parser, predict=(None, None))
+    outcome = await stage_ocr(mock_file)
+
+    assert outcome.label is None
+    assert outcome.confidence is None
+    mocks.predict.assert_called_once_with(_OCR_PREVIEW)
+    assert (
+        _EXPECTED_MOCK_LOGS["ocr_stage_model_no_prediction"]
+        in mocks.logger.debug.call_args_list
+    )
+    assert (
+        _EXPECTED_MOCK_LOGS["ocr_stage_no_match"] in mocks.logger.debug.call_args_list
+    )
+
 
-    with (
-        patch.dict(
-            "src.classification.stages.ocr.IMAGE_EXTRACTORS", {"jpg": mock_image_parser}
+# Text and OCR stages share the same error handling
+@pytest.mark.parametrize(
+    "stage_mod, stage_fn, filename, ext, content, content_type, error",
+    [
+        pytest.param(
+            text,
+            stage_text,
+            "error.txt",
+            "txt",
+            b"content",
+            "text/plain",
+            "Simulated extraction error",
+            id="text",
         ),
-        patch("src.classification.stages.ocr._MODEL_AVAILABLE", True),
-        patch(
-            "src.classification.stages.ocr.predict", return_value=(None, None)
-        ) as mock_model_predict,  # Model returns no prediction
-        patch("src.classification.stages.ocr.logger") as mock_logger,
-    ):
-        outcome = await stage_ocr(mock_file)
+        pytest.param(
+            ocr,
+            stage_ocr,
+            "error.jpg",
+            "jpg",
+            _IMG,
+            "image/jpeg",
+            "Simulated OCR error",
+            id="ocr",
+        ),
+    ],
+)
+async def test_stage_extraction_error(
+    mock_upload_file_factory,
+    arm_stage,
+    stage_mod: ModuleType,
+    stage_fn: Callable[..., Awaitable[StageOutcome]],
+    filename: str,
+    ext: str,
+    content: bytes,
+    content_type: str,
+    error: str,
+) -> None:
+    """Tests stage handling of generic exception during text extraction."""
+    mock_file = mock_upload_file_factory(filename, content, content_type)
+    prefix = stage_mod.__name__.rsplit(".", 1)[-1]  # "text" or "ocr"
+
+    mocks = arm_stage(stage_mod, ext, _raiser(Exception(error)))
+    outcome = await stage_fn(mock_file)
+
+    assert outcome.label is None
+    assert outcome.confidence is None
+    mocks.predict.assert_not_called()
+    mocks.logger.error.assert_called_once_with(
+        f"{prefix}_stage_extraction_error",
+        filename=filename,
+        extension=ext,
+        error=error,
+        exc_info=True,
+    )
 
-        assert outcome.label is None
-        assert outcome.confidence is None
-        mock_model_predict.assert_called_once_with("very unique ocr content")
-        mock_logger.debug.assert_any_call(
-            "ocr_stage_model_no_prediction",
-            filename="nomatch.jpg",
-            text_preview="very unique ocr content"[:100],
-        )
-        mock_logger.debug.assert_any_call(
-            "ocr_stage_no_match",
-            filename="nomatch.jpg",
-            text_preview="very unique ocr content"[:100],
-        )
+
+@pytest.mark.parametrize(
+    "stage_mod, stage_fn, filename, ext, content, content_type, extracted",
+    [
+        pytest.param(
+            text,
+            stage_text,
+            "predict_error.txt",
+            "txt",
+            b"content",
+            "text/plain",
+            "some text",
+            id="text",
+        ),
+        pytest.param(
+            ocr,
+            stage_ocr,
+            "predict_error.png",
+            "png",
+            _IMG,
+            "image/png",
+            "some ocr text",
+            id="ocr",
+        ),
+    ],
+)
+async def test_stage_model_prediction_error(
+    mock_upload_file_factory,
+    arm_stage,
+    stage_mod: ModuleType,
+    stage_fn: Callable[..., Awaitable[StageOutcome]],
+    filename: str,
+    ext: str,
+    content: bytes,
+    content_type: str,
+    extracted: str,
+) -> None:
+    """Tests stage handling of generic exception during model prediction."""
+    mock_file = mock_upload_file_factory(filename, content, content_type)
+    prefix = stage_mod.__name__.rsplit(".", 1)[-1]  # "text" or "ocr"
+
+    mocks = arm_stage(
+        stage_mod,
+        ext,
+        _returner(extracted),
+        predict_exc=Exception("Simulated prediction error"),
+    )
+    outcome = await stage_fn(mock_file)
+
+    assert outcome.label is None
+    assert outcome.confidence is None
+    mocks.predict.assert_called_once_with(extracted)
+    mocks.logger.error.assert_called_once_with(
+        f"{prefix}_stage_model_prediction_error",
+        filename=filename,
+        error="Simulated prediction error",
+        exc_info=True,
+    )
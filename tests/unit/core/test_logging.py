@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import logging
+import logging.handlers
 from unittest.mock import patch, ANY
 
 import pytest
@@ -96,3 +98,74 @@ def test_configure_logging_sets_info_level():
             mock_structlog_config.call_args[1]["wrapper_class"]
             == mock_make_filtering_logger.return_value
         )
+
+
+def test_configure_logging_renders_json_via_stdlib(capsys, monkeypatch):
+    """structlog events are queued through stdlib and rendered as JSON."""
+    # Leave the listener owned by the app's own configuration untouched.
+    monkeypatch.setattr("src.core.logging._QUEUE_LISTENER", None)
+    configure_logging(debug=False)
+
+    root_logger = logging.getLogger()
+    assert isinstance(root_logger.handlers[0], logging.handlers.QueueHandler)
+    (stream_handler,) = src.core.logging._QUEUE_LISTENER.handlers
+    assert isinstance(stream_handler.formatter, structlog.stdlib.ProcessorFormatter)
+
+    structlog.get_logger("test").warning("json_event", answer=42)
+    structlog.get_logger("test").debug("filtered_event")
+    src.core.logging._stop_queue_listener()  # drain the queue
+
+    lines = capsys.readouterr().err.strip().splitlines()
+    assert len(lines) == 1
+    payload = json.loads(lines[0])
+    assert payload["event"] == "json_event"
+    assert payload["answer"] == 42
+    assert payload["level"] == "warning"
+
+
+def test_stdlib_records_keep_caller_contextvars(capsys, monkeypatch):
+    """Foreign stdlib records carry the caller's contextvars through the queue."""
+    monkeypatch.setattr("src.core.logging._QUEUE_LISTENER", None)
+    configure_logging(debug=False)
+
+    structlog.contextvars.bind_contextvars(request_id="abc", path="/files")
+    try:
+        logging.getLogger("uvicorn.error").warning("stdlib %s", "event")
+    finally:
+        structlog.contextvars.clear_contextvars()
+    src.core.logging._stop_queue_listener()  # drain on the listener thread
+
+    (line,) = capsys.readouterr().err.strip().splitlines()
+    payload = json.loads(line)
+    assert payload["event"] == "stdlib event"
+    assert payload["request_id"] == "abc"
+    assert payload["path"] == "/files"
+    assert payload["level"] == "warning"
+    assert "timestamp" in payload
+
+
+@pytest.mark.parametrize(
+    ("method", "has_traceback"), [("exception", True), ("error", False)]
+)
+def test_exc_info_rendered_as_exception_field(
+    capsys, monkeypatch, method: str, has_traceback: bool
+):
+    """Active exceptions are formatted in the caller thread before queueing."""
+    monkeypatch.setattr("src.core.logging._QUEUE_LISTENER", None)
+    configure_logging(debug=False)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        getattr(structlog.get_logger("test"), method)("failed_event")
+    src.core.logging._stop_queue_listener()  # drain the queue
+
+    (line,) = capsys.readouterr().err.strip().splitlines()
+    payload = json.loads(line)
+    assert payload["event"] == "failed_event"
+    if has_traceback:
+        assert "Traceback (most recent call last)" in payload["exception"]
+        assert "ValueError: boom" in payload["exception"]
+    else:
+        assert "exception" not in payload
+        assert "exc_info" not in payload